@@ -1,25 +1,12 @@
 #!/usr/bin/env python3
 import os
 import sys
+import json
+import time
 import shutil
 import pathlib
-import requests
 import argparse
-
-try:
-    import requests
-except ImportError:
-    sys.exit("You need requests. run 'pip install requests'")
-
-try:
-    from bs4 import BeautifulSoup
-except ImportError:
-    sys.exit("You need BeautifulSoup. run 'pip install bs4'")
-
-try:
-    from fake_useragent import UserAgent
-except ImportError:
-    sys.exit("You need UserAgent. run 'pip install fake-useragent'")
+import concurrent.futures
 
 parser = argparse.ArgumentParser(description='Fetches random Kattis Questions')
 parser.add_argument('--id', type=str, default='_NONE_', help='id of problem to fetch')
@@ -34,38 +21,99 @@ if qid == '_NONE_':
 PROBLEMS_PATH = './problems/'
 PROBLEM_PATH = PROBLEMS_PATH + qid
 
-if os.path.isdir(PROBLEM_PATH + qid):
+if os.path.isdir(PROBLEM_PATH):
     print('This problem already exists.')
     exit(1)
-url = 'http://open.kattis.com/problems/' + qid
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:
+    sys.exit("You need requests. run 'pip install requests'")
+
+try:
+    from bs4 import BeautifulSoup, SoupStrainer
+except ImportError:
+    sys.exit("You need BeautifulSoup. run 'pip install bs4'")
+
+try:
+    import lxml
+except ImportError:
+    sys.exit("You need lxml. run 'pip install lxml'")
+
+try:
+    from fake_useragent import UserAgent
+except ImportError:
+    sys.exit("You need UserAgent. run 'pip install fake-useragent'")
+
+PROBLEMS_URL = 'https://open.kattis.com/problems/'
+
+url = PROBLEMS_URL + qid
 sth = 'https://cpbook.net/methodstosolve?oj=kattis&topic=all&quality=all'
+HINTS_PATH = './hints.json'
+HINTS_TTL = 24 * 60 * 60
+
+def fetch_hints(session):
+    if os.path.isfile(HINTS_PATH) and time.time() - os.path.getmtime(HINTS_PATH) < HINTS_TTL:
+        with open(HINTS_PATH) as f:
+            return json.load(f)
+    try:
+        hintpage = session.get(sth)
+        hintpage.raise_for_status()
+    except requests.RequestException:
+        return {}
+    hintclasses = {'class': ['Kattis starred','Kattis nonstarred']}
+    hintrows = SoupStrainer('tr', attrs=hintclasses)
+    hints = {}
+    for hinter in BeautifulSoup(hintpage.content, 'lxml', parse_only=hintrows).find_all('tr', attrs=hintclasses):
+        td = hinter.find_all('td', recursive=False)
+        if len(td) < 4:
+            continue
+        hints.setdefault(td[0].text, (td[2].text, td[3].text))
+    if hints:
+        tmp_path = '%s.%d.tmp'%(HINTS_PATH, os.getpid())
+        with open(tmp_path, 'w') as f:
+            json.dump(hints, f)
+        os.replace(tmp_path, HINTS_PATH)
+    return hints
+
 usa = UserAgent()
 
-page = requests.get(url, headers={'User-Agent':str(usa.random)})
-soup = BeautifulSoup(page.content, 'html.parser')
+session = requests.Session()
+session.headers.update({'User-Agent': str(usa.random)})
+session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=3, backoff_factor=0.5)))
 
+with concurrent.futures.ThreadPoolExecutor(max_workers=2) as ex:
+    f_page = ex.submit(session.get, url)
+    f_hint = ex.submit(fetch_hints, session) if hint else None
+    page = f_page.result()
+    hints = f_hint.result() if f_hint else {}
 
-hinttype = ""
-hinttext = ""
-if hint:
-    hintpage = requests.get(sth, headers={'User-Agent': str(usa.random)})
-    pars = BeautifulSoup(hintpage.content, 'html.parser')
-    hintinp = pars.find_all('tr', attrs={'class': ['Kattis starred','Kattis nonstarred']})
-    for hinter in hintinp:
-        td = hinter.find_all('td')
-        if td[0].text == qid:
-            hinttype = td[2].text
-            hinttext = td[3].text
-            break
+page.raise_for_status()
+
+soup = BeautifulSoup(page.content, 'lxml')
+hinttype, hinttext = hints.get(qid, ("", ""))
 
 tableinp = soup.find_all('table', attrs={'class': 'sample'})
 pathlib.Path(PROBLEM_PATH).mkdir(parents=True, exist_ok=True)
 
+DROP_DIV_CLASSES = {'wrap', 'description', 'footer', 'problem-download'}
+
+def is_clutter(tag):
+    if tag.name in ('img', 'a'):
+        return True
+    classes = tag.get('class') or []
+    if tag.name == 'section':
+        return ' '.join(classes) == 'box clearfix main-content problem-sidebar'
+    if tag.name == 'div':
+        return ' '.join(classes) == 'footer-powered col-md-8' or any(c in DROP_DIV_CLASSES for c in classes)
+    return False
+
 htmlfile = soup
-for section in htmlfile.find_all('section', {'class': 'box clearfix main-content problem-sidebar'}): section.decompose()
-for div in htmlfile.find_all('div', {'class':['wrap', 'description','footer','problem-download','footer-powered col-md-8']}): div.decompose()
-for img in htmlfile.find_all('img'): img.decompose()
-for a in htmlfile.find_all('a'): a.decompose()
+for tag in htmlfile.find_all(is_clutter):
+    if not tag.decomposed:
+        tag.decompose()
 
 if hint:
     hinttype_p = htmlfile.new_tag('p')
@@ -75,33 +123,29 @@ if hint:
     htmlfile.html.append(hinttype_p)
     htmlfile.html.append(hinttext_p)
 
-pathlib.Path(PROBLEM_PATH + '/' + qid + '.html').write_text(str(htmlfile))
-
-i = 0
-for sample in tableinp:
+problem_files = [(PROBLEM_PATH + '/' + qid + '.html', str(htmlfile))]
+for i, sample in enumerate(tableinp, 1):
     tablestd = sample.find_all('pre')
-    pathlib.Path(PROBLEM_PATH + '/input' + str(i + 1)).write_text(tablestd[0].text)
-    pathlib.Path(PROBLEM_PATH + '/output' + str(i + 1)).write_text(tablestd[1].text)
-    i += 1
+    problem_files.append((PROBLEM_PATH + '/input' + str(i), tablestd[0].text))
+    problem_files.append((PROBLEM_PATH + '/output' + str(i), tablestd[1].text))
 
 src = os.curdir
 dst = os.path.join(src, PROBLEM_PATH)
 cpp = os.path.join(src, 'template.cpp')
 
-shutil.copy(cpp, dst)
-
-dstfile = os.path.join(dst,'template.cpp')
 newfile = os.path.join(dst,'_' + qid + '.cpp')
-os.rename(dstfile, newfile)
+
+with concurrent.futures.ThreadPoolExecutor(max_workers=8) as ex:
+    writes = [ex.submit(pathlib.Path(path).write_text, text) for path, text in problem_files]
+    writes.append(ex.submit(shutil.copyfile, cpp, newfile))
+    for write in writes:
+        write.result()
 
 python_file_path = (PROBLEM_PATH + '/_' + qid + '.py')
 
-with open(python_file_path, 'w+') as python_file:
+fd = os.open(python_file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+with os.fdopen(fd, 'w') as python_file:
     python_file.write('#!/usr/bin/env python3\n')
-    os.chmod(python_file_path, 0o777)
-
-if not os.path.isfile('./seen.txt'):
-    open('seen.txt', 'w+')
 
 with open('seen.txt','a') as f:
     f.write(qid + '\n')
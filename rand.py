@@ -2,22 +2,12 @@
 import os
 import sys
 import random
+import pathlib
 import argparse
-
-try:
-    import requests
-except ImportError:
-    sys.exit("You need requests. run 'pip install requests'")
-
-try:
-    from bs4 import BeautifulSoup
-except ImportError:
-    sys.exit("You need BeautifulSoup. run 'pip install bs4'")
-
-try:
-    from fake_useragent import UserAgent
-except ImportError:
-    sys.exit("You need UserAgent. run 'pip install fake-useragent'")
+import itertools
+import collections
+import subprocess
+import concurrent.futures
 
 parser = argparse.ArgumentParser(description='Runs Kattis problem through their test cases')
 parser.add_argument('--lobound', type=float, default=None, help='the lower bound for questions')
@@ -41,47 +31,77 @@ if lobound > 10 or upbound > 10:
 if n is None:
     n = int(input('How many questions: '))
 
-seenlist = []
-if os.path.isfile('./seen.txt'):
-    seenlist = [line.rstrip('\n') for line in open('/' + os.getcwd() + '/seen.txt')]
-qlist = []
-end = False
-i = 0
-
-while end is False:
-    url = 'https://open.kattis.com/problems?page=' + str(i) + '&order=problem_difficulty'
-    usa = UserAgent()
-    page = requests.get(url, headers={'User-Agent':str(usa.random)})
-    soup = BeautifulSoup(page.content, 'html.parser')
-
-    table = soup.find('table', attrs={'class': 'problem_list table sortable table-responsive table-kattis center table-hover table-multiple-head-rows table-compact'})
-
-    if table is None:
-        end = True
-        break
-
-    tbody = table.find('tbody')
-    questions = tbody.find_all('tr')
-
-    for tr in questions:
-        tds = tr.find_all('td')
-        
-        try:
-            diff = float(tds[8].text)
-        except ValueError:
-            continue
-
-        if diff > upbound:
-            end = True
-            break
-
-        elif diff >= lobound and diff <= upbound:
-            idurl = tds[0].find('a')['href']
-            if idurl.split('/')[2] not in seenlist:
-                qlist.append(idurl.split('/')[2])
-    i += 1
+try:
+    import requests
+except ImportError:
+    sys.exit("You need requests. run 'pip install requests'")
+
+try:
+    from lxml import etree, html
+except ImportError:
+    sys.exit("You need lxml. run 'pip install lxml'")
+
+try:
+    from fake_useragent import UserAgent
+except ImportError:
+    sys.exit("You need UserAgent. run 'pip install fake-useragent'")
+
+PROBLEM_LIST_URL = 'https://open.kattis.com/problems?order=problem_difficulty&page='
+PROBLEM_TABLE = etree.XPath('//table[contains(@class, "problem_list")]')
+PROBLEM_ROWS = etree.XPath('./tbody/tr')
+
+SEEN_PATH = pathlib.Path('seen.txt')
+seen = set(SEEN_PATH.read_text().splitlines()) if SEEN_PATH.exists() else set()
+
+PAGES_IN_FLIGHT = 4
+
+usa = UserAgent()
+session = requests.Session()
+session.headers.update({'User-Agent': str(usa.random)})
+
+def fetch_page(i):
+    url = PROBLEM_LIST_URL + str(i)
+    page = session.get(url)
+
+    return html.fromstring(page.content)
+
+def fetch_pages():
+    with concurrent.futures.ThreadPoolExecutor(max_workers=PAGES_IN_FLIGHT) as ex:
+        pages = itertools.count()
+        pending = collections.deque(ex.submit(fetch_page, i) for i in itertools.islice(pages, PAGES_IN_FLIGHT))
+        while True:
+            doc = pending.popleft().result()
+            pending.append(ex.submit(fetch_page, next(pages)))
+            yield doc
+
+def candidates():
+    for doc in fetch_pages():
+        table = PROBLEM_TABLE(doc)
+        if not table:
+            return
+
+        for tr in PROBLEM_ROWS(table[0]):
+            tds = tr.findall('td')
+
+            try:
+                diff = float(tds[8].text_content())
+            except ValueError:
+                continue
+
+            if diff > upbound:
+                return
+
+            elif diff >= lobound and diff <= upbound:
+                pid = tds[0].find('.//a').get('href').split('/')[2]
+                if pid not in seen:
+                    seen.add(pid)
+                    yield pid
+
+qlist = list(candidates())
 
 random.shuffle(qlist)
 
-for j in range(min(n,len(qlist))):
-    os.popen('/' + os.getcwd() + '/fetch.py --id ' + qlist[j])
+fetch = os.path.join(os.getcwd(), 'fetch.py')
+procs = [subprocess.Popen([sys.executable, fetch, '--id', qid]) for qid in qlist[:max(n, 0)]]
+for proc in procs:
+    proc.wait()
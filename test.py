@@ -2,9 +2,10 @@
 import os
 import sys
 import argparse
+import subprocess
+import concurrent.futures
 
 ISON_WINDOWS = sys.platform == 'win32'
-WRITER_NAME = 'type' if ISON_WINDOWS else 'cat'
 parser = argparse.ArgumentParser(description='Runs Kattis problem through their test cases')
 parser.add_argument('--id', type=str, default='_NONE_', help='id of problem to fetch')
 args = parser.parse_args()
@@ -25,25 +26,44 @@ while qext != 'c' and qext != 'p':
 
 if qext == 'p':
     EXE_NAME = '%s/_%s.py'%(qdir,qid)
+    RUN_CMD = [sys.executable, EXE_NAME]
 else:
     EXE_NAME = '%s/_%s.exe'%(qdir,qid) if ISON_WINDOWS else '%s/_%s'%(qdir,qid)
+    RUN_CMD = [EXE_NAME]
 
-isinfile_inqdir = lambda name: name.startswith("input") and os.path.isfile(os.path.join(qdir,name))
-input_files = list(filter(isinfile_inqdir, os.listdir(qdir)))
-ilen = len(input_files)
+with os.scandir(qdir) as it:
+    cases = sorted(int(e.name[5:]) for e in it if e.name.startswith('input') and e.name[5:].isdigit() and e.is_file())
 
-os.system('g++ "' + qdir + '/_' + qid + '.cpp" -o ' + EXE_NAME)
+if qext == 'c':
+    CPP_NAME = '%s/_%s.cpp'%(qdir,qid)
+    if not os.path.isfile(EXE_NAME) or os.path.getmtime(CPP_NAME) > os.path.getmtime(EXE_NAME):
+        if subprocess.run(['g++', '-O2', '-pipe', CPP_NAME, '-o', EXE_NAME]).returncode != 0:
+            sys.exit('Compilation failed.')
 
-for i in range(ilen):
-    print('TEST CASE ' + str(i+1))
-    output = os.popen('%s \"'%WRITER_NAME + os.path.join(qdir,'input' + str(i+1)) + '\" | %s'%EXE_NAME).read().rstrip()
+def normalize(data):
+    return data.replace(b'\r\n', b'\n').replace(b'\r', b'\n').rstrip()
+
+def echo(data):
+    sys.stdout.flush()
+    sys.stdout.buffer.write(data + b'\n')
+
+def run_case(i):
+    with open(os.path.join(qdir,'input' + str(i)), 'rb') as fin:
+        output = normalize(subprocess.run(RUN_CMD, stdin=fin, stdout=subprocess.PIPE).stdout)
+    with open(qdir + '/output' + str(i), 'rb') as expected:
+        content = normalize(expected.read())
+    return output, content
+
+with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+    results = list(ex.map(run_case, cases))
+
+for i, (output, content) in zip(cases, results):
+    print('TEST CASE ' + str(i))
     print('OUTPUT:')
-    print(output)
-    with open(qdir + '/output' + str(i+1)) as expected:
-        content = expected.read().rstrip()
-        print('EXPECTED OUTPUT:')
-        print(content)
-        if content==output:
-            print('PASSED')
-        else:
-            print('FAILED')
+    echo(output)
+    print('EXPECTED OUTPUT:')
+    echo(content)
+    if content==output:
+        print('PASSED')
+    else:
+        print('FAILED')